@@ -0,0 +1,299 @@
+import copy
+from types import SimpleNamespace
+
+# Backend em memória com a mesma interface usada do cliente Supabase pelas funções gerar_* do main.py:
+#   backend.table(nome).select(colunas).execute().data
+#   backend.table(nome).insert(linhas).execute().data
+#   backend.table(nome).update(valores).eq(coluna, valor).execute().data
+#   filtros gte/lte/is_/in_, order e range (paginação) nas consultas select
+# Permite medir o custo de CPU dos geradores sem rede e de forma determinística.
+
+
+class ErroBackend(Exception):
+    pass
+
+
+# Espelho do SQL/tabelas_iniciais.sql: identity, valores padrão e restrições de unicidade de cada tabela
+ESQUEMA = {
+    'veiculo': {
+        'identity': True,
+        'padroes':  {'statusdisponibilidade': 'Disponível', 'tier': 'Básico'},
+        'unicos':   [('placa',)],
+    },
+    'seguro': {
+        'identity': True,
+        'padroes':  {'cobertura': None},
+        'unicos':   [],
+    },
+    'cliente': {
+        'identity': True,
+        'padroes':  {'email': None, 'telefone': None},
+        'unicos':   [('cnh',), ('email',)],
+    },
+    'aluguel': {
+        'identity': True,
+        'padroes':  {'status': 'Ativo'},
+        'unicos':   [],
+    },
+    'manutencao': {
+        'identity': True,
+        'padroes':  {'datafim': None, 'status': 'Pendente', 'descricao': None},
+        'unicos':   [],
+    },
+    'servico': {
+        'identity': True,
+        'padroes':  {'descricao': None},
+        'unicos':   [],
+    },
+    'aluguel_servico': {
+        'identity': False,
+        'padroes':  {},
+        'unicos':   [('id_aluguel', 'id_servico')],
+    },
+    'mecanico': {
+        'identity': True,
+        'padroes':  {'especialidade': None},
+        'unicos':   [],
+    },
+    'manutencao_mecanico': {
+        'identity': False,
+        'padroes':  {},
+        'unicos':   [('id_manutencao', 'id_mecanico')],
+    },
+}
+
+
+class Tabela:
+    def __init__(self, nome, esquema):
+        self.nome = nome
+        self.esquema = esquema
+        self.linhas: list[dict] = []
+        self.proximo_id = 1
+        # Índice de cada restrição de unicidade: colunas -> conjunto de valores já usados
+        self.indices: dict[tuple, set] = {cols: set() for cols in esquema['unicos']}
+        # Índice da chave primária para updates por id sem varrer a tabela
+        self.por_id: dict[int, dict] = {}
+        # Índices por coluna (valor -> posições das linhas) e resultados de consultas já filtradas,
+        # criados sob demanda e descartados a cada escrita. Evitam varrer a tabela inteira a cada
+        # página de range() e a cada lote de in_()
+        self.indices_coluna: dict[str, dict] = {}
+        self.cache_consultas: dict[tuple, list[dict]] = {}
+
+    def invalidar(self):
+        self.indices_coluna.clear()
+        self.cache_consultas.clear()
+
+    def indice_coluna(self, coluna):
+        if coluna not in self.indices_coluna:
+            indice: dict = {}
+            for pos, r in enumerate(self.linhas):
+                indice.setdefault(r.get(coluna), []).append(pos)
+            self.indices_coluna[coluna] = indice
+        return self.indices_coluna[coluna]
+
+    def selecionar(self, filtros, ordem):
+        chave = (tuple(filtros), ordem)
+        if chave in self.cache_consultas:
+            return self.cache_consultas[chave]
+        # Usa o índice da coluna do primeiro filtro eq/in para reduzir as linhas candidatas
+        base = next((f for f in filtros if f[0] in ('eq', 'in')), None)
+        if base is None:
+            linhas = self.linhas
+        else:
+            indice = self.indice_coluna(base[1])
+            valores = [base[2]] if base[0] == 'eq' else base[2]
+            posicoes = sorted(p for v in valores for p in indice.get(v, ()))
+            linhas = [self.linhas[p] for p in posicoes]
+        linhas = [r for r in linhas if all(aplicar_filtro(f, r) for f in filtros)]
+        if ordem:
+            linhas = sorted(linhas, key=lambda r: tuple(r.get(c) for c in ordem))
+        self.cache_consultas[chave] = linhas
+        return linhas
+
+    def inserir(self, novas):
+        preparadas = []
+        vistos = {cols: set() for cols in self.indices}
+        for linha in novas:
+            if self.esquema['identity'] and 'id' in linha:
+                # Colunas GENERATED ALWAYS AS IDENTITY não aceitam valores informados
+                raise ErroBackend(f"A coluna id de {self.nome} é gerada automaticamente e não pode ser informada.")
+            registro = dict(self.esquema['padroes'])
+            registro.update(linha)
+            for cols, usados in self.indices.items():
+                chave = tuple(registro.get(c) for c in cols)
+                if None in chave:
+                    continue # NULL não viola UNIQUE no Postgres
+                if chave in usados or chave in vistos[cols]:
+                    raise ErroBackend(f"Valor duplicado em {self.nome}{cols}: {chave}")
+                vistos[cols].add(chave)
+            preparadas.append(registro)
+
+        # O insert é atômico: só grava depois que todas as linhas foram validadas
+        for registro in preparadas:
+            if self.esquema['identity']:
+                registro = {'id': self.proximo_id, **registro}
+                self.proximo_id += 1
+                self.por_id[registro['id']] = registro
+            for cols, usados in self.indices.items():
+                chave = tuple(registro.get(c) for c in cols)
+                if None not in chave:
+                    usados.add(chave)
+            self.linhas.append(registro)
+        self.invalidar()
+        return [dict(r) for r in self.linhas[len(self.linhas) - len(preparadas):]]
+
+    def atualizar(self, valores, coluna, valor):
+        if self.esquema['identity'] and 'id' in valores:
+            raise ErroBackend(f"A coluna id de {self.nome} é gerada automaticamente e não pode ser alterada.")
+        if coluna == 'id' and self.esquema['identity']:
+            alvo = [self.por_id[valor]] if valor in self.por_id else []
+        else:
+            alvo = [r for r in self.linhas if r.get(coluna) == valor]
+
+        # Valida todas as linhas antes de alterar qualquer uma, como no inserir
+        trocas = {} # colunas -> lista de (chave antiga, chave nova)
+        for cols, usados in self.indices.items():
+            if not any(c in valores for c in cols):
+                continue
+            pares = [(tuple(r.get(c) for c in cols), tuple(valores.get(c, r.get(c)) for c in cols)) for r in alvo]
+            antigas = {antiga for antiga, _ in pares} # Chaves liberadas pelas próprias linhas do update
+            novas = set()
+            for _, nova in pares:
+                if None in nova:
+                    continue # NULL não viola UNIQUE no Postgres
+                if nova in novas or (nova in usados and nova not in antigas):
+                    raise ErroBackend(f"Valor duplicado em {self.nome}{cols}: {nova}")
+                novas.add(nova)
+            trocas[cols] = pares
+
+        for cols, pares in trocas.items():
+            usados = self.indices[cols]
+            for antiga, _ in pares:
+                usados.discard(antiga)
+            for _, nova in pares:
+                if None not in nova:
+                    usados.add(nova)
+        for registro in alvo:
+            registro.update(valores)
+        if alvo:
+            self.invalidar()
+        return [dict(r) for r in alvo]
+
+
+#Avalia um filtro (operação, coluna, valor) em uma linha. Comparações com NULL nunca são verdadeiras, como no Postgres.
+def aplicar_filtro(filtro, r):
+    op, coluna, valor = filtro
+    atual = r.get(coluna)
+    if op == 'eq':
+        return atual == valor
+    if op == 'in':
+        return atual in valor
+    if op == 'is':
+        return atual is None
+    if atual is None:
+        return False
+    return atual >= valor if op == 'gte' else atual <= valor
+
+
+class Consulta:
+    def __init__(self, tabela):
+        self.tabela = tabela
+        self.operacao = None
+        self.colunas = None
+        self.valores = None
+        self.filtros = []
+        self.ordem = () # Colunas de order(), na ordem em que foram chamadas
+        self.intervalo = None
+        self.igualdade = None # Filtro eq() usado pelo update
+
+    def select(self, colunas='*'):
+        self.operacao = 'select'
+        if colunas.strip() != '*':
+            self.colunas = [c.strip() for c in colunas.split(',')]
+        return self
+
+    def insert(self, linhas):
+        self.operacao = 'insert'
+        self.valores = linhas if isinstance(linhas, list) else [linhas]
+        return self
+
+    def update(self, valores):
+        self.operacao = 'update'
+        self.valores = valores
+        return self
+
+    def eq(self, coluna, valor):
+        self.filtros.append(('eq', coluna, valor))
+        self.igualdade = (coluna, valor)
+        return self
+
+    def gte(self, coluna, valor):
+        self.filtros.append(('gte', coluna, valor))
+        return self
+
+    def lte(self, coluna, valor):
+        self.filtros.append(('lte', coluna, valor))
+        return self
+
+    def is_(self, coluna, valor):
+        if valor != 'null':
+            raise ErroBackend("is_ suporta apenas 'null'.")
+        self.filtros.append(('is', coluna, None))
+        return self
+
+    def in_(self, coluna, valores):
+        self.filtros.append(('in', coluna, frozenset(valores)))
+        return self
+
+    def order(self, coluna):
+        self.ordem += (coluna,)
+        return self
+
+    def range(self, inicio, fim):
+        self.intervalo = (inicio, fim)
+        return self
+
+    def execute(self):
+        if self.operacao == 'insert':
+            dados = self.tabela.inserir(copy.deepcopy(self.valores))
+        elif self.operacao == 'update':
+            if len(self.filtros) != 1 or self.igualdade is None:
+                raise ErroBackend("update exige exatamente um filtro eq().")
+            coluna, valor = self.igualdade
+            dados = self.tabela.atualizar(dict(self.valores), coluna, valor)
+        elif self.operacao == 'select':
+            linhas = self.tabela.selecionar(self.filtros, self.ordem)
+            if self.intervalo:
+                linhas = linhas[self.intervalo[0]:self.intervalo[1] + 1]
+            if self.colunas is None:
+                dados = [dict(r) for r in linhas]
+            else:
+                dados = [{c: r.get(c) for c in self.colunas} for r in linhas]
+        else:
+            raise ErroBackend("Nenhuma operação definida para a consulta.")
+        return SimpleNamespace(data=dados)
+
+
+class MemoriaBackend:
+    def __init__(self):
+        self.tabelas = {nome: Tabela(nome, esquema) for nome, esquema in ESQUEMA.items()}
+
+    def table(self, nome):
+        if nome not in self.tabelas:
+            raise ErroBackend(f"Tabela inexistente: {nome}")
+        return Consulta(self.tabelas[nome])
+
+    #Insere os dados base do SQL/Dados_iniciais.sql (seguros e serviços), necessários para gerar aluguéis.
+    def carregar_dados_iniciais(self):
+        self.table('seguro').insert([
+            {'tipo': 'Básico',   'cobertura': 'Danos a terceiros',                 'valorbasico': 80.00,  'valoravancado': 150.00},
+            {'tipo': 'Completo', 'cobertura': 'Cobertura total + assistência 24h', 'valorbasico': 200.00, 'valoravancado': 350.00},
+        ]).execute()
+        self.table('servico').insert([
+            {'nome': 'GPS',                 'descricao': 'Navegação GPS com mapas atualizados',       'valorpadrao': 40.00},
+            {'nome': 'Assento Infantil',    'descricao': 'Cadeira de segurança para criança',         'valorpadrao': 25.00},
+            {'nome': 'Wi-Fi',               'descricao': 'Internet a bordo até 5 GB por dia',         'valorpadrao': 20.00},
+            {'nome': 'Proteção de Pneus',   'descricao': 'Cobertura contra danos em pneus',           'valorpadrao': 15.00},
+            {'nome': 'Motorista Adicional', 'descricao': 'Habilita um segundo motorista no contrato', 'valorpadrao': 100.00},
+        ]).execute()
+        return self
@@ -0,0 +1,59 @@
+import io
+import sys
+import random
+import statistics
+import time
+from contextlib import redirect_stdout
+from datetime import date
+
+import main
+from backend import MemoriaBackend
+
+# Benchmark dos geradores do main.py contra o backend em memória (sem rede).
+# Cada cenário parte de um banco vazio (apenas com os dados iniciais) e executa gerar_tudo(nivel)
+# várias rodadas seguidas: como os dados se acumulam, as últimas rodadas mostram o custo com o banco maior.
+
+# Cenários: (nível, rodadas). O último acumula milhares de linhas por tabela para evidenciar os trechos mais lentos
+CENARIOS = [(1, 20), (3, 20), (5, 20), (5, 100)]
+SEMENTE = 10
+# Data fixa usada como "hoje" pelos geradores, para que o resultado não dependa do dia da execução
+DATA_FIXA = date(2025, 1, 1)
+
+
+#Executa gerar_tudo(nivel) por várias rodadas em um backend novo e retorna o tempo de cada rodada e o backend final.
+def medir(nivel: int, rodadas: int):
+    random.seed(SEMENTE)
+    main.fake.seed_instance(SEMENTE)
+    main.fake.unique.clear()
+    backend = MemoriaBackend().carregar_dados_iniciais()
+    main.usar_backend(backend)
+
+    tempos = []
+    data_original = main.DATA_HOJE
+    main.DATA_HOJE = DATA_FIXA
+    try:
+        for _ in range(rodadas):
+            inicio = time.perf_counter()
+            with redirect_stdout(io.StringIO()): # Descarta as mensagens dos geradores
+                main.gerar_tudo(nivel)
+            tempos.append(time.perf_counter() - inicio)
+    finally:
+        main.DATA_HOJE = data_original
+    return tempos, backend
+
+
+def executar(fator: float = 1):
+    print(f"Benchmark de gerar_tudo no backend em memória (semente {SEMENTE}, hoje = {DATA_FIXA})")
+    print(f"{'nível':>5} | {'rodadas':>7} | {'total (s)':>9} | {'mediana (ms)':>12} | {'primeira (ms)':>13} | {'última (ms)':>11} | linhas")
+    for nivel, rodadas in CENARIOS:
+        rodadas = max(1, round(rodadas * fator))
+        tempos, backend = medir(nivel, rodadas)
+        linhas = sum(len(t.linhas) for t in backend.tabelas.values())
+        print(f"{nivel:>5} | {rodadas:>7} | {sum(tempos):>9.3f} | {statistics.median(tempos) * 1000:>12.2f} | "
+              f"{tempos[0] * 1000:>13.2f} | {tempos[-1] * 1000:>11.2f} | {linhas}")
+
+
+if __name__ == "__main__":
+    # Uso: python benchmark.py [fator]
+    #   fator: multiplica a quantidade de rodadas de todos os cenários (padrão 1)
+    executar(float(sys.argv[1]) if len(sys.argv) > 1 else 1)
@@ -1,7 +1,7 @@
 import os
 from dotenv import load_dotenv
-from supabase import create_client, Client
 import random
+import heapq
 from faker import Faker
 from datetime import datetime, timedelta
 
@@ -14,11 +14,29 @@ _raw_key = os.getenv("SUPABASE_KEY", "")
 SUPABASE_URL = _raw_url.strip().strip('"')
 SUPABASE_KEY = _raw_key.strip().strip('"')
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError("As variáveis SUPABASE_URL e SUPABASE_KEY não foram carregadas corretamente.")
+# Backend usado pelas funções gerar_* (cliente Supabase ou backend.MemoriaBackend).
+# Precisa oferecer table().select/insert/update/eq(...).execute().data
+supabase = None
 
-# Criar cliente Supabase
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+#Cria o cliente Supabase a partir das variáveis de ambiente.
+def criar_cliente_supabase():
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise ValueError("As variáveis SUPABASE_URL e SUPABASE_KEY não foram carregadas corretamente.")
+    from supabase import create_client
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+#Define o backend de armazenamento usado pelas funções gerar_*.
+def usar_backend(backend):
+    global supabase
+    supabase = backend
+
+# Data usada como "hoje" pelos geradores (None usa a data atual).
+# O benchmark fixa esta data para que os resultados não dependam do dia da execução
+DATA_HOJE = None
+
+#Retorna a data considerada como atual pelos geradores.
+def data_atual():
+    return DATA_HOJE or datetime.now().date()
 
 # Gerar nomes e frases em português
 fake = Faker('pt_BR')
@@ -129,7 +147,7 @@ def gerar_alugueis(qtd: int = 2):
         veh_map.setdefault(vid, []).append((s, e))
 
     alugueis = [] # Lista para armazenar os alugueis
-    hoje      = datetime.now().date() # Data atual
+    hoje      = data_atual() # Data atual
     # Período de escolha para novas datas
     inicio_min = hoje - timedelta(days=90) # No máximo 90 dias passados
     fim_max    = hoje + timedelta(days=60) # No máximo 60 dias futuros
@@ -233,6 +251,166 @@ def gerar_alugueis(qtd: int = 2):
         print("Nenhum aluguel gerado.")
 
 
+#Capacidade de trabalho de um mecânico por dia (em horas)
+HORAS_DIA_MECANICO = 8
+
+#Quantidade de linhas por página nas consultas (o Supabase retorna no máximo 1000 linhas por requisição)
+TAMANHO_PAGINA = 1000
+#Quantidade de ids por filtro in_ nas consultas (evita URLs longas demais)
+TAMANHO_LOTE_IDS = 200
+
+#Executa a consulta página a página com .range() e retorna todas as linhas.
+def selecionar_paginado(consulta):
+    # Parâmetro:
+    #   consulta: função sem parâmetros que monta a consulta (select, filtros e order), sem executá-la
+    linhas = []
+    inicio = 0
+    while True:
+        pagina = consulta().range(inicio, inicio + TAMANHO_PAGINA - 1).execute().data or []
+        linhas.extend(pagina)
+        if len(pagina) < TAMANHO_PAGINA:
+            return linhas
+        inicio += TAMANHO_PAGINA
+
+#Retorna o período (datainicio, datafim) de uma manutenção como datetime.date.
+def periodo_manutencao(m):
+    s = datetime.fromisoformat(m['datainicio']).date()
+    e = datetime.fromisoformat(m['datafim']).date() if m.get('datafim') else s # Se datafim estiver nula, assume o mesmo dia
+    return s, e
+
+#Converte uma manutenção (do banco ou recém inserida) em sua lista de dias de trabalho.
+def dias_manutencao(m) -> list:
+    s, e = periodo_manutencao(m)
+    return [s + timedelta(days=i) for i in range((e - s).days + 1)]
+
+#Filtra as manutenções cujo período se sobrepõe a [inicio, fim].
+def filtrar_periodo(manutencoes, inicio, fim):
+    filtradas = []
+    for m in manutencoes:
+        s, e = periodo_manutencao(m)
+        if s <= fim and inicio <= e:
+            filtradas.append(m)
+    return filtradas
+
+#Carrega do banco apenas as manutenções que podem se sobrepor ao período [inicio, fim].
+def carregar_manutencoes_periodo(inicio, fim):
+    colunas = 'id, idveiculo, datainicio, datafim'
+    ini, f = inicio.strftime("%Y-%m-%d"), fim.strftime("%Y-%m-%d")
+    com_fim = selecionar_paginado(lambda: supabase.table('manutencao').select(colunas)
+                                  .gte('datafim', ini).lte('datainicio', f).order('id'))
+    # Manutenções com datafim nula ocupam apenas o dia de início
+    sem_fim = selecionar_paginado(lambda: supabase.table('manutencao').select(colunas)
+                                  .is_('datafim', 'null').gte('datainicio', ini).lte('datainicio', f).order('id'))
+    return com_fim + sem_fim
+
+#Carrega os vínculos mecânico-manutenção das manutenções informadas, em lotes de ids.
+def carregar_vinculos(ids_manutencao):
+    ids = list(ids_manutencao)
+    vinculos = []
+    for i in range(0, len(ids), TAMANHO_LOTE_IDS):
+        lote = ids[i:i + TAMANHO_LOTE_IDS]
+        vinculos.extend(selecionar_paginado(lambda: supabase.table('manutencao_mecanico')
+                                            .select('id_manutencao, id_mecanico, horas_trabalhadas')
+                                            .in_('id_manutencao', lote)
+                                            .order('id_manutencao').order('id_mecanico'))) # Chave única: paginação estável
+    return vinculos
+
+#Monta a agenda de capacidade dos mecânicos a partir das alocações já existentes no banco.
+def carregar_agenda(vinculos, manutencoes, inicio=None, fim=None):
+    # Parâmetros:
+    #   inicio, fim: se informados, apenas os dias dentro de [inicio, fim] entram na agenda e na carga
+    # Retorno:
+    #   agenda: (mecanico_id, dia) -> horas já alocadas naquele dia
+    #   carga:  mecanico_id -> total de horas já alocadas (no período, quando informado)
+    dias_por_manut = {m['id']: dias_manutencao(m) for m in manutencoes if 'id' in m}
+    agenda: dict[tuple[int, datetime.date], float] = {}
+    carga: dict[int, float] = {}
+    for v in vinculos:
+        dias = dias_por_manut.get(v['id_manutencao'])
+        if not dias:
+            continue
+        por_dia = float(v['horas_trabalhadas']) / len(dias) # As horas da manutenção são distribuídas igualmente entre os seus dias
+        for d in dias:
+            if (inicio and d < inicio) or (fim and d > fim):
+                continue
+            agenda[(v['id_mecanico'], d)] = agenda.get((v['id_mecanico'], d), 0) + por_dia
+            carga[v['id_mecanico']] = carga.get(v['id_mecanico'], 0) + por_dia
+    return agenda, carga
+
+#Indexa os mecânicos por especialidade em filas de prioridade ordenadas pela carga de trabalho (menos carregado primeiro).
+def indexar_mecanicos(mecanicos, carga):
+    filas: dict[str, list[tuple[float, float, int]]] = {}
+    for mech in mecanicos:
+        esp = (mech.get('especialidade') or '').lower()
+        # (horas alocadas, desempate aleatório, id do mecânico)
+        filas.setdefault(esp, []).append((carga.get(mech['id'], 0), random.random(), mech['id']))
+    for fila in filas.values():
+        heapq.heapify(fila)
+    return filas
+
+#Aloca até 2 mecânicos compatíveis por manutenção sem exceder HORAS_DIA_MECANICO em nenhum dia.
+def alocar_mecanicos(manutencoes, mecanicos, vinculos=(), existentes=(), max_mecanicos: int = 2):
+    # Parâmetros:
+    #   manutencoes: manutenções recém inseridas (com id, tipo, datainicio e datafim)
+    #   mecanicos:   registros da tabela 'mecanico'
+    #   vinculos:    registros já existentes da tabela 'manutencao_mecanico'
+    #   existentes:  manutenções já existentes no banco, usadas para datar os vínculos
+    if not manutencoes:
+        return []
+    # Só os dias do período coberto pelas novas manutenções importam para a capacidade
+    periodos = [periodo_manutencao(m) for m in manutencoes]
+    inicio = min(s for s, _ in periodos)
+    fim = max(e for _, e in periodos)
+    existentes = filtrar_periodo(existentes, inicio, fim)
+    agenda, carga = carregar_agenda(vinculos, list(existentes) + list(manutencoes), inicio, fim)
+    filas = indexar_mecanicos(mecanicos, carga)
+
+    #Verifica se o mecânico tem capacidade livre de pelo menos por_dia horas em todos os dias da manutenção.
+    def tem_capacidade(mid, dias, por_dia):
+        return all(HORAS_DIA_MECANICO - agenda.get((mid, d), 0) >= por_dia for d in dias)
+
+    mm = []
+    for m in manutencoes:
+        fila = filas.get(m['tipo'].lower())
+        if not fila:
+            continue
+        dias = dias_manutencao(m)
+        # As horas de cada vaga são sorteadas antes da escolha, assim a rejeição depende apenas da capacidade
+        horas_vagas = [round(random.uniform(1, 4), 2) for _ in range(max_mecanicos)]
+        descartados = [] # Mecânicos sem capacidade para uma vaga, devolvidos à fila ao final
+        alocados = []    # Mecânicos escolhidos, devolvidos à fila ao final com a nova carga
+        for horas in horas_vagas:
+            por_dia = horas / len(dias)
+            escolhido = None
+            # Um mecânico rejeitado em uma vaga anterior ainda pode caber em uma vaga com menos horas
+            for i, item in enumerate(descartados):
+                if tem_capacidade(item[2], dias, por_dia):
+                    escolhido = descartados.pop(i)
+                    break
+            while escolhido is None and fila:
+                item = heapq.heappop(fila)
+                if tem_capacidade(item[2], dias, por_dia):
+                    escolhido = item
+                else:
+                    descartados.append(item)
+            if escolhido is None:
+                continue
+            total, _, mid = escolhido
+            for d in dias:
+                agenda[(mid, d)] = agenda.get((mid, d), 0) + por_dia
+            mm.append({
+                'id_manutencao':     m['id'],
+                'id_mecanico':       mid,
+                'horas_trabalhadas': horas
+            })
+            alocados.append((total + horas, random.random(), mid))
+        for item in descartados + alocados:
+            heapq.heappush(fila, item)
+        if not alocados:
+            print(f"Nenhum mecânico com capacidade livre para a manutenção {m['id']}.")
+    return mm
+
+
 #Gera registros de manutenção para veículos disponíveis, sem permitir sobreposição de períodos e, associas mecânicos com especialidade compatível
 def gerar_manutencoes(qtd: int = 1):
     # Busca os veículos disponíveis
@@ -242,8 +420,13 @@ def gerar_manutencoes(qtd: int = 1):
         print("Nenhum veículo disponível para manutenção.")
         return
 
-    # Carrega manutenções já existentes para evitar sobreposição
-    resp_manut = supabase.table('manutencao').select('idveiculo, datainicio, datafim').execute().data or []
+    hoje = data_atual()  # Data atual
+    # Período de escolha para novas datas
+    inicio_min = hoje - timedelta(days=90) # Maximo de 90 dias passados
+    fim_max = hoje + timedelta(days=60) # Maximo de 60 dias futuros
+
+    # Carrega as manutenções já existentes que podem se sobrepor ao período de escolha
+    resp_manut = carregar_manutencoes_periodo(inicio_min, fim_max)
 
     # Mapa: veiculo_id -> lista de tuplas com (datainicio, datafim)
     manut_map: dict[int, list[tuple[datetime.date, datetime.date]]] = {} # Dicionário que armazena, para cada veiculo, os períodos em que ele foi para manutenção.
@@ -257,10 +440,6 @@ def gerar_manutencoes(qtd: int = 1):
         manut_map.setdefault(vid, []).append((s, e))
 
     manutencoes_data = []
-    hoje = datetime.now().date()  # Data atual
-    # Período de escolha para novas datas
-    inicio_min = hoje - timedelta(days=90) # Maximo de 90 dias passados
-    fim_max = hoje + timedelta(days=60) # Maximo de 60 dias futuros
 
     # Gera registros de manutenção
     for _ in range(qtd):
@@ -334,19 +513,13 @@ def gerar_manutencoes(qtd: int = 1):
             {'statusdisponibilidade': novo_status}
         ).eq('id', m['idveiculo']).execute()
     
-    # Associa mecânicos compatíveis com o tipo da manutenção
-    mecanicos = supabase.table('mecanico').select('id, especialidade').execute().data or []
-    mm = []
-    for m in result.data:
-        mec_validos = [mech for mech in mecanicos if mech['especialidade'].lower() == m['tipo'].lower()]
-        if mec_validos:
-            escolhidos = random.sample(mec_validos, k=min(2, len(mec_validos))) # Mecanico valido aleatorio
-            for mech in escolhidos:
-                mm.append({
-                    'id_manutencao':     m['id'],
-                    'id_mecanico':       mech['id'],
-                    'horas_trabalhadas': round(random.uniform(1, 4), 2)
-                })
+    # Associa mecânicos compatíveis com o tipo da manutenção, respeitando a capacidade diária de cada um
+    mecanicos = selecionar_paginado(lambda: supabase.table('mecanico').select('id, especialidade').order('id'))
+    # Apenas os vínculos das manutenções que se sobrepõem às novas afetam a capacidade
+    periodos = [periodo_manutencao(m) for m in result.data]
+    sobrepostas = filtrar_periodo(resp_manut, min(s for s, _ in periodos), max(e for _, e in periodos))
+    vinculos = carregar_vinculos(m['id'] for m in sobrepostas)
+    mm = alocar_mecanicos(result.data, mecanicos, vinculos, sobrepostas)
     # Adiciona os dados na tabela 'manutencao_mecanico'
     if mm:
         supabase.table('manutencao_mecanico').insert(mm).execute()
@@ -376,6 +549,8 @@ def gerar_tudo(nivel: int):
     gerar_alugueis(qtd_alugueis)
 
 if __name__ == "__main__":
+    # Criar cliente Supabase
+    usar_backend(criar_cliente_supabase())
     # Gera dados em nível 5 (pode ser ajustado conforme necessário)
     gerar_tudo(5)
     print("Dados inseridos com sucesso!")
@@ -0,0 +1,160 @@
+import os
+import io
+import sys
+import csv
+import gzip
+import json
+import tarfile
+import hashlib
+from contextlib import closing
+from datetime import datetime
+from dotenv import load_dotenv
+import psycopg2
+
+# Carregar variáveis de ambiente
+load_dotenv()
+
+# Obter e normalizar a string de conexão direta com o Postgres (Supabase > Project Settings > Database)
+_raw_db_url = os.getenv("DATABASE_URL", "")
+DATABASE_URL = _raw_db_url.strip().strip('"')
+
+# Tabelas do modelo em ordem de dependência (chaves estrangeiras sempre apontam para tabelas anteriores)
+TABELAS = [
+    'seguro',
+    'servico',
+    'cliente',
+    'veiculo',
+    'mecanico',
+    'aluguel',
+    'manutencao',
+    'aluguel_servico',
+    'manutencao_mecanico',
+]
+
+# Tabelas com coluna id gerada por identity (as junções N:M usam chave composta)
+TABELAS_IDENTITY = ['seguro', 'servico', 'cliente', 'veiculo', 'mecanico', 'aluguel', 'manutencao']
+
+VERSAO_SNAPSHOT = 1
+
+
+def conectar():
+    if not DATABASE_URL:
+        raise ValueError("A variável DATABASE_URL não foi carregada corretamente.")
+    return psycopg2.connect(DATABASE_URL)
+
+
+#Conta as linhas de um CSV com cabeçalho (campos entre aspas podem conter quebras de linha).
+def contar_linhas_csv(dados: bytes) -> int:
+    leitor = csv.reader(io.StringIO(dados.decode('utf-8'), newline=''))
+    return max(sum(1 for _ in leitor) - 1, 0) # Desconsidera o cabeçalho
+
+
+#Lê o estado atual (last_value, is_called) da sequência identity de uma tabela.
+def ler_sequencia(cur, tabela):
+    cur.execute("SELECT pg_get_serial_sequence(%s, 'id')", (f'public.{tabela}',))
+    seq = cur.fetchone()[0]
+    cur.execute(f"SELECT last_value, is_called FROM {seq}")
+    last_value, is_called = cur.fetchone()
+    return {'sequencia': seq, 'last_value': last_value, 'is_called': is_called}
+
+
+#Captura todas as tabelas em um arquivo .tar com um CSV comprimido por tabela, checksums e valores das sequências.
+def capturar(caminho: str):
+    manifesto = {
+        'versao':     VERSAO_SNAPSHOT,
+        'criado_em':  datetime.now().isoformat(timespec='seconds'),
+        'tabelas':    {},
+        'sequencias': {},
+    }
+    # Grava em um arquivo temporário e só o renomeia ao final, para nunca deixar um snapshot incompleto em caminho
+    temporario = f'{caminho}.tmp'
+    try:
+        # closing() fecha a conexão; o "with conn" interno faz commit/rollback da transação
+        with closing(conectar()) as conn, conn, conn.cursor() as cur, tarfile.open(temporario, 'w') as tar:
+            # Leitura consistente de todas as tabelas no mesmo instante
+            cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+            for tabela in TABELAS:
+                buf = io.BytesIO()
+                cur.copy_expert(f"COPY public.{tabela} TO STDOUT WITH (FORMAT csv, HEADER true)", buf)
+                dados = buf.getvalue()
+                comprimido = gzip.compress(dados, compresslevel=6, mtime=0) # mtime fixo para o arquivo ser reprodutível
+                nome = f'{tabela}.csv.gz'
+                info = tarfile.TarInfo(nome)
+                info.size = len(comprimido)
+                tar.addfile(info, io.BytesIO(comprimido))
+                manifesto['tabelas'][tabela] = {
+                    'arquivo': nome,
+                    'linhas':  contar_linhas_csv(dados),
+                    'sha256':  hashlib.sha256(dados).hexdigest(),
+                }
+            for tabela in TABELAS_IDENTITY:
+                manifesto['sequencias'][tabela] = ler_sequencia(cur, tabela)
+
+            corpo = json.dumps(manifesto, indent=2, ensure_ascii=False).encode('utf-8')
+            info = tarfile.TarInfo('manifest.json')
+            info.size = len(corpo)
+            tar.addfile(info, io.BytesIO(corpo))
+        os.replace(temporario, caminho)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+    total = sum(t['linhas'] for t in manifesto['tabelas'].values())
+    print(f"Snapshot salvo em {caminho} ({total} linhas em {len(TABELAS)} tabelas).")
+    return manifesto
+
+
+#Lê o snapshot e confere o checksum de cada tabela antes de qualquer alteração no banco.
+def ler_snapshot(caminho: str):
+    with tarfile.open(caminho, 'r') as tar:
+        manifesto = json.loads(tar.extractfile('manifest.json').read().decode('utf-8'))
+        if manifesto.get('versao') != VERSAO_SNAPSHOT:
+            raise ValueError(f"Versão de snapshot não suportada: {manifesto.get('versao')}")
+        dados = {}
+        for tabela in TABELAS:
+            meta = manifesto['tabelas'][tabela]
+            conteudo = gzip.decompress(tar.extractfile(meta['arquivo']).read())
+            if hashlib.sha256(conteudo).hexdigest() != meta['sha256']:
+                raise ValueError(f"Checksum inválido para a tabela {tabela}. O snapshot está corrompido.")
+            if contar_linhas_csv(conteudo) != meta['linhas']:
+                raise ValueError(f"Quantidade de linhas inválida para a tabela {tabela}. O snapshot está corrompido.")
+            dados[tabela] = conteudo
+    return manifesto, dados
+
+
+#Restaura o snapshot em um banco criado a partir de SQL/tabelas_iniciais.sql, substituindo todos os dados.
+def restaurar(caminho: str):
+    manifesto, dados = ler_snapshot(caminho)
+    # closing() fecha a conexão; o "with conn" interno faz commit/rollback da transação
+    with closing(conectar()) as conn, conn, conn.cursor() as cur:
+        # Tudo ocorre em uma única transação: em caso de erro nenhum dado é alterado
+        cur.execute("TRUNCATE TABLE " + ", ".join(f"public.{t}" for t in TABELAS) + " RESTART IDENTITY CASCADE")
+        for tabela in TABELAS:
+            # COPY grava os ids do arquivo mesmo em colunas GENERATED ALWAYS AS IDENTITY
+            cur.copy_expert(f"COPY public.{tabela} FROM STDIN WITH (FORMAT csv, HEADER true)", io.BytesIO(dados[tabela]))
+            # Confere se o banco recebeu exatamente as linhas do snapshot (um erro desfaz toda a transação)
+            cur.execute(f"SELECT count(*) FROM public.{tabela}")
+            carregadas = cur.fetchone()[0]
+            if carregadas != manifesto['tabelas'][tabela]['linhas']:
+                raise ValueError(f"Tabela {tabela}: {carregadas} linhas carregadas, {manifesto['tabelas'][tabela]['linhas']} esperadas.")
+        for tabela in TABELAS_IDENTITY:
+            seq = manifesto['sequencias'][tabela]
+            cur.execute(
+                "SELECT setval(pg_get_serial_sequence(%s, 'id'), %s, %s)",
+                (f'public.{tabela}', seq['last_value'], seq['is_called'])
+            )
+    total = sum(t['linhas'] for t in manifesto['tabelas'].values())
+    print(f"Snapshot {caminho} restaurado ({total} linhas em {len(TABELAS)} tabelas).")
+
+
+if __name__ == "__main__":
+    # Uso:
+    #   python snapshot.py capturar <arquivo.tar>
+    #   python snapshot.py restaurar <arquivo.tar>
+    if len(sys.argv) != 3 or sys.argv[1] not in ('capturar', 'restaurar'):
+        print("Uso: python snapshot.py [capturar|restaurar] <arquivo.tar>")
+        sys.exit(1)
+    if sys.argv[1] == 'capturar':
+        capturar(sys.argv[2])
+    else:
+        restaurar(sys.argv[2])
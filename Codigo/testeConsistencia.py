@@ -24,10 +24,32 @@ supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 # Funções básicas
 # ---------------------
 
-# Carrega as tabelas em um dataframe pandas
+# Capacidade de trabalho de um mecânico por dia, em horas (mesmo valor de HORAS_DIA_MECANICO em main.py)
+HORAS_DIA_MECANICO = 8
+
+# Quantidade de linhas por página (o Supabase retorna no máximo 1000 linhas por requisição)
+TAMANHO_PAGINA = 1000
+
+# Chave única de cada tabela, usada para ordenar a paginação (sem ordem, páginas podem repetir ou perder linhas)
+CHAVES_TABELAS = {
+    "aluguel_servico":     ["id_aluguel", "id_servico"],
+    "manutencao_mecanico": ["id_manutencao", "id_mecanico"],
+}
+
+# Carrega as tabelas em um dataframe pandas, página a página
 def carregarTabelas(table):
     print(f"🔄 Carregando dados da tabela {table}...")
-    data = supabase.table(table).select("*").execute().data
+    data = []
+    inicio = 0
+    while True:
+        consulta = supabase.table(table).select("*")
+        for coluna in CHAVES_TABELAS.get(table, ["id"]):
+            consulta = consulta.order(coluna)
+        pagina = consulta.range(inicio, inicio + TAMANHO_PAGINA - 1).execute().data or []
+        data.extend(pagina)
+        if len(pagina) < TAMANHO_PAGINA:
+            break
+        inicio += TAMANHO_PAGINA
     return pd.DataFrame(data)
 
 # Verifica se há campos nulos na coluna
@@ -129,6 +151,29 @@ def checarMecanicos(df_mm, df_mec, df_man):
         print("⚠️ Não foi possível verificar mecânicos - colunas necessárias não encontradas")
 
 
+# Verifica se nenhum mecânico ultrapassa a capacidade diária de horas
+# As horas de cada manutenção são distribuídas igualmente entre os seus dias, como na alocação do main.py
+def checarCapacidadeMecanicos(df_mm, df_man):
+    if all(col in df_mm.columns for col in ['id_mecanico', 'id_manutencao', 'horas_trabalhadas']) and \
+       all(col in df_man.columns for col in ['id', 'datainicio', 'datafim']):
+
+        print(f"\n Verificando capacidade diária dos mecânicos...")
+
+        df = df_mm.merge(df_man[['id', 'datainicio', 'datafim']], left_on='id_manutencao', right_on='id')
+        inicio = pd.to_datetime(df['datainicio'])
+        fim = pd.to_datetime(df['datafim'].fillna(df['datainicio'])) # Se datafim estiver nula, assume o mesmo dia
+        df['dia'] = [pd.date_range(s, e) for s, e in zip(inicio, fim)]
+        df['horas_dia'] = df['horas_trabalhadas'].astype(float) / df['dia'].str.len()
+        por_dia = df.explode('dia').groupby(['id_mecanico', 'dia'])['horas_dia'].sum()
+        inconsistencias = por_dia[por_dia > HORAS_DIA_MECANICO + 1e-6] # Tolerância para arredondamento
+        if not inconsistencias.empty:
+            print(f"❌ Mecânicos acima de {HORAS_DIA_MECANICO}h em um dia! Quantidade de dias: {len(inconsistencias)}")
+        else:
+            print(f"✅ Nenhum mecânico ultrapassa {HORAS_DIA_MECANICO}h por dia.")
+    else:
+        print("⚠️ Não foi possível verificar a capacidade dos mecânicos - colunas necessárias não encontradas")
+
+
 # Verifica se as placas dos veículos estão no formato correto e se são únicas
 # Formato esperado: ABC-1D23 ou ABC1234
 def checarPlacas(df):
@@ -319,6 +364,7 @@ if 'manutencao' in dfs:
 
 if all(tabela in dfs for tabela in ['manutencao_mecanico', 'mecanico', 'manutencao']):
     checarMecanicos(dfs['manutencao_mecanico'], dfs['mecanico'], dfs['manutencao'])
+    checarCapacidadeMecanicos(dfs['manutencao_mecanico'], dfs['manutencao'])
 
 if 'veiculo' in dfs:
     checarPlacas(dfs['veiculo'])
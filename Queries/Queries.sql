@@ -145,3 +145,35 @@ LEFT JOIN aluguel a ON v.id = a.idveiculo
 LEFT JOIN manutencao m ON v.id = m.idveiculo
 GROUP BY v.modelo
 ORDER BY total_alugueis DESC, total_manutencoes DESC;
+
+-- Query 11: Mostrar a utilização dos mecanicos (horas alocadas por dia de manutenção em relação à capacidade diária de 8 horas)
+-- As horas de cada manutenção são distribuídas igualmente entre os seus dias, como feito na alocação em main.py
+SELECT 
+  mec.id,
+  mec.nome,
+  mec.especialidade,
+  COALESCE(tot.total_manutencoes, 0) AS total_manutencoes,
+  COALESCE(tot.total_horas, 0) AS total_horas,
+  ROUND(COALESCE(pico.horas_dia, 0)::numeric / 8 * 100, 2) AS pico_utilizacao_pct
+FROM mecanico mec
+LEFT JOIN (
+  SELECT id_mecanico, COUNT(*) AS total_manutencoes, SUM(horas_trabalhadas) AS total_horas
+  FROM manutencao_mecanico
+  GROUP BY id_mecanico
+) AS tot ON tot.id_mecanico = mec.id
+LEFT JOIN (
+  -- Maior soma de horas de cada mecanico em um mesmo dia, agregada uma única vez para todos os mecanicos
+  SELECT x.id_mecanico, MAX(x.horas_dia) AS horas_dia
+  FROM (
+    SELECT 
+      mm.id_mecanico,
+      d.dia,
+      SUM(mm.horas_trabalhadas / ((COALESCE(m.datafim, m.datainicio) - m.datainicio) + 1)) AS horas_dia
+    FROM manutencao_mecanico mm
+    JOIN manutencao m ON m.id = mm.id_manutencao
+    CROSS JOIN LATERAL generate_series(m.datainicio, COALESCE(m.datafim, m.datainicio), interval '1 day') AS d(dia)
+    GROUP BY mm.id_mecanico, d.dia
+  ) AS x
+  GROUP BY x.id_mecanico
+) AS pico ON pico.id_mecanico = mec.id
+ORDER BY pico_utilizacao_pct DESC, total_horas DESC;